@@ -1,21 +1,30 @@
+import io
 import json
 from pathlib import Path
 import random
 import string
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
-from PIL import Image, ImageOps
 import datetime
 import re
+from styles import PRIMARY, ACCENT, CUSTOM_CSS, WHEEL_TRACKER_CSS
+from templates import (
+    HEADER_HTML, INPUT_HERO_HTML, NUMBERPLATE_TEMPLATE, MARKET_SNAPSHOT_HTML, MARKET_STATS_HTML,
+    SPECIALTY_BADGE_TEMPLATES,
+    format_gbp, price_forecast_html, status_badges_html,
+    valuation_card_html, upgrade_options_html, deal_bonuses_html,
+    network_offers_html,
+)
 
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
 
-PRIMARY = "#0b3b6f"
-ACCENT = "#1e90ff"
-PAGE_BG = "#e6f0fa"
-
 PLATE_REGEX = re.compile(r"[A-Z0-9]{5,10}", re.I)
+PLATE_MIN_LENGTH = 5
+PLATE_MAX_LENGTH = 10
+# Uppercases ASCII letters and drops spaces/tabs/hyphens in a single translate()
+REG_CLEAN_TABLE = str.maketrans(string.ascii_lowercase, string.ascii_uppercase, " \t-")
 
 # Sales Pipeline Stages
 SALES_STAGES = [
@@ -26,7 +35,14 @@ SALES_STAGES = [
     {"name": "Collection Day", "icon": "🚗", "color": "#f44336"}
 ]
 
-GARAGES = [
+# Stage state -> (timeline label, colour) for the customer tracker
+STAGE_TIMELINE_STYLES = {
+    "completed": ("✅ Completed", "#4caf50"),
+    "current": ("📍 Current Stage", ACCENT),
+    "pending": ("⏳ Upcoming", "#bbb"),
+}
+
+GARAGES = (
     "Sytner BMW Cardiff - 285-287 Penarth Road",
     "Sytner BMW Chigwell - Langston Road, Loughton",
     "Sytner BMW Coventry - 128 Holyhead Road",
@@ -49,7 +65,7 @@ GARAGES = [
     "Sytner BMW Warwick - Fusiliers Way",
     "Sytner BMW Wolverhampton - Lever Street",
     "Sytner BMW Worcester - Knightsbridge Park"
-]
+)
 
 GARAGE_COORDS = {
     "Sytner BMW Cardiff": (51.4695, -3.1792),
@@ -76,7 +92,38 @@ GARAGE_COORDS = {
     "Sytner BMW Worcester": (52.1936, -2.2200)
 }
 
-TIME_SLOTS = ["09:00 AM", "11:00 AM", "02:00 PM", "04:00 PM"]
+TIME_SLOTS = ("09:00 AM", "11:00 AM", "02:00 PM", "04:00 PM")
+
+# (location, offset from the best offer, badge) for the network comparison tab
+NETWORK_OFFER_OFFSETS = (
+    ("Sytner BMW Solihull", 0, "🏆 Best Offer"),
+    ("Sytner BMW Birmingham", -200, ""),
+    ("Sytner BMW Coventry", -400, ""),
+)
+
+# (model, model year, list price) shown as upgrade targets on the valuation tab
+UPGRADE_OPTIONS = (
+    ("BMW 3 Series 320d M Sport", 2023, 38000),
+    ("BMW X3 xDrive20d M Sport", 2023, 48000),
+    ("BMW 5 Series 530e M Sport", 2024, 52000),
+)
+
+CONDITION_MULTIPLIERS = {"excellent": 1.05, "good": 1.0, "fair": 0.9, "poor": 0.8}
+
+# MOT result -> (icon, colour); anything other than a pass is shown as an advisory
+MOT_RESULT_STYLES = {"Pass": ("✅", "#4caf50")}
+MOT_RESULT_DEFAULT_STYLE = ("⚠️", "#ff9800")
+
+# recall['open'] -> (icon, status text, colour)
+RECALL_STATUS_STYLES = {
+    True: ("🔴", "OPEN - ACTION REQUIRED", "#f44336"),
+    False: ("✅", "COMPLETED", "#4caf50"),
+}
+
+VALUATION_VALIDITY_HOURS = 48
+# Recall and history (write-off/theft) data must stay fresh, so lookups are
+# only cached briefly
+LOOKUP_CACHE_TTL_SECONDS = 15 * 60
 
 # ============================================================================
 # MOCK API FUNCTIONS
@@ -107,9 +154,10 @@ def find_nearest_garage(user_lat, user_lon):
             return garage, min_distance
     return None, None
 
+@st.cache_data(ttl=LOOKUP_CACHE_TTL_SECONDS, show_spinner=False)
 def lookup_vehicle_basic(reg):
     """Mock vehicle lookup"""
-    reg_clean = reg.upper().replace(" ", "")
+    reg_clean = clean_registration(reg)
     return {
         "reg": reg_clean,
         "make": "BMW",
@@ -119,9 +167,9 @@ def lookup_vehicle_basic(reg):
         "mileage": 54000
     }
 
-def lookup_mot_and_tax(reg):
+@st.cache_data(ttl=LOOKUP_CACHE_TTL_SECONDS, show_spinner=False)
+def lookup_mot_and_tax(reg, today):
     """Mock MOT and tax lookup"""
-    today = datetime.date.today()
     return {
         "mot_next_due": (today + datetime.timedelta(days=120)).isoformat(),
         "mot_history": [
@@ -131,6 +179,7 @@ def lookup_mot_and_tax(reg):
         "tax_expiry": (today + datetime.timedelta(days=30)).isoformat(),
     }
 
+@st.cache_data(ttl=LOOKUP_CACHE_TTL_SECONDS, show_spinner=False)
 def lookup_recalls(reg_or_vin):
     """Mock recall lookup"""
     return [
@@ -138,6 +187,7 @@ def lookup_recalls(reg_or_vin):
         {"id": "R-2022-012", "summary": "Steering column check", "open": False}
     ]
 
+@st.cache_data(ttl=LOOKUP_CACHE_TTL_SECONDS, show_spinner=False)
 def get_history_flags(reg):
     """Mock history check"""
     return {
@@ -147,19 +197,40 @@ def get_history_flags(reg):
         "note": "Mileage shows a 5,000 jump in 2021 record"
     }
 
-def estimate_value(make, model, year, mileage, condition="good"):
-    """Mock valuation"""
-    age = datetime.date.today().year - year
+def estimate_value(make, model, year, mileage, condition="good", current_year=None):
+    """Mock valuation (pass current_year to reuse a date already read this render)"""
+    if current_year is None:
+        current_year = datetime.date.today().year
+    age = current_year - year
     base = 25000 - (age * 2000) - (mileage / 10)
-    cond_multiplier = {"excellent": 1.05, "good": 1.0, "fair": 0.9, "poor": 0.8}
-    return max(100, int(base * cond_multiplier.get(condition, 1.0)))
+    return max(100, int(base * CONDITION_MULTIPLIERS.get(condition, 1.0)))
+
+# Keyed on today as well as reg so MOT/tax due dates roll over at midnight.
+# Each lookup is cached on its own too, so if one raises, a retry only re-runs
+# that lookup; this outer cache just saves starting threads on a full hit.
+@st.cache_data(ttl=LOOKUP_CACHE_TTL_SECONDS, show_spinner=False)
+def lookup_all(reg, today):
+    """Run the vehicle, MOT/tax, recall and history lookups concurrently"""
+    with ThreadPoolExecutor(max_workers=4, thread_name_prefix="vehicle-lookup") as executor:
+        vehicle = executor.submit(lookup_vehicle_basic, reg)
+        mot_tax = executor.submit(lookup_mot_and_tax, reg, today)
+        recalls = executor.submit(lookup_recalls, reg)
+        history_flags = executor.submit(get_history_flags, reg)
+        return vehicle.result(), mot_tax.result(), recalls.result(), history_flags.result()
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def load_oriented_image(image_bytes):
+    """Decode an uploaded photo and apply its EXIF orientation"""
+    from PIL import Image, ImageOps
+    return ImageOps.exif_transpose(Image.open(io.BytesIO(image_bytes)))
 
 def mock_ocr_numberplate(image):
     """Mock OCR"""
     return "KT68XYZ"
 
+@st.cache_resource(show_spinner=False)
 def get_sytner_buyers():
-    """Return list of Sytner buyers"""
+    """Return list of Sytner buyers (shared across sessions - do not mutate)"""
     return [
         {
             "name": "Sarah Mitchell",
@@ -218,6 +289,15 @@ def get_sytner_buyers():
         },
     ]
 
+@st.cache_resource(show_spinner=False)
+def get_buyers_by_garage():
+    """Map each garage to the first buyer (in list order) who covers it"""
+    by_garage = {}
+    for buyer in get_sytner_buyers():
+        for garage in buyer['covers_garages']:
+            by_garage.setdefault(garage, buyer)
+    return by_garage
+
 # ============================================================================
 # SALES CHECK-IN DATA FUNCTIONS
 # ============================================================================
@@ -278,12 +358,17 @@ def get_journey_by_tracking_id(tracking_id):
 # VALIDATION FUNCTIONS
 # ============================================================================
 
+def clean_registration(reg):
+    """Normalise a registration: drop spaces/hyphens and uppercase"""
+    return reg.translate(REG_CLEAN_TABLE)
+
 def validate_registration(reg):
     """Validate UK registration format"""
     if not reg:
         return False
-    reg_clean = reg.upper().replace(" ", "")
-    return len(reg_clean) >= 5 and re.match(r'^[A-Z0-9]+$', reg_clean)
+    reg_clean = clean_registration(reg)
+    return (PLATE_MIN_LENGTH <= len(reg_clean) <= PLATE_MAX_LENGTH
+            and reg_clean.isascii() and reg_clean.isalnum())
 
 def validate_phone(phone):
     """Basic phone validation"""
@@ -293,80 +378,81 @@ def validate_phone(phone):
 # SESSION STATE MANAGEMENT
 # ============================================================================
 
+# (key, factory) pairs - factories give each session its own mutable values
+SESSION_DEFAULTS = (
+    ("reg", lambda: None),
+    ("image", lambda: None),
+    ("show_summary", lambda: False),
+    ("vehicle_data", lambda: None),
+    ("open_booking_form", lambda: None),
+    ("create_journey_mode", lambda: False),
+    ("journey_data", dict),
+    ("journey_created", lambda: None),
+)
+
 def init_session_state():
     """Initialize all session state variables"""
-    defaults = {
-        "reg": None,
-        "image": None,
-        "show_summary": False,
-        "vehicle_data": None,
-        "booking_forms": {},
-        "create_journey_mode": False,
-        "journey_data": {},
-        "journey_created": None,
-    }
-    for key, value in defaults.items():
-        if key not in st.session_state:
-            st.session_state[key] = value
+    state = st.session_state
+    if state.get("_session_initialized"):
+        return
+    state.update({
+        key: factory() for key, factory in SESSION_DEFAULTS
+        if key not in state
+    })
+    state["_session_initialized"] = True
 
 def reset_all_state():
     """Reset all session state to initial values"""
-    st.session_state.reg = None
-    st.session_state.image = None
-    st.session_state.show_summary = False
-    st.session_state.vehicle_data = None
-    st.session_state.booking_forms = {}
+    st.session_state.update(
+        reg=None,
+        image=None,
+        show_summary=False,
+        vehicle_data=None,
+        open_booking_form=None,
+    )
+
+# Button callbacks run before the rerun a click triggers, so the page is
+# drawn once with the new state instead of twice via st.rerun().
+def set_state(key, value):
+    """Set a session state key (for use as an on_click callback)"""
+    st.session_state[key] = value
+
+def clear_state(key):
+    """Remove a session state key if present (for use as an on_click callback)"""
+    st.session_state.pop(key, None)
 
 # ============================================================================
 # ANIMATED WHEEL TRACKER
 # ============================================================================
 
+def stage_states(current_stage_index, total_stages):
+    """State of each stage ('completed', 'current' or 'pending') for a journey"""
+    return (("completed",) * current_stage_index + ("current",)
+            + ("pending",) * (total_stages - current_stage_index - 1))
+
 def render_wheel_tracker(current_stage_index, stages):
     """Render an animated car wheel progress tracker"""
     
     total_stages = len(stages)
     progress_percent = ((current_stage_index + 1) / total_stages) * 100
-    rotation = (progress_percent / 100) * 360
     current_stage = stages[current_stage_index]
     
     # Build all dots HTML first
-    dots_html = ""
-    for idx, stage in enumerate(stages):
-        if idx < current_stage_index:
-            dot_class = "completed"
-        elif idx == current_stage_index:
-            dot_class = "current"
-        else:
-            dot_class = "pending"
-        
-        dots_html += f'<div class="stage-dot {dot_class}" title="{stage["name"]}">{stage["icon"]}</div>'
+    dots_html = "".join(
+        f'<div class="stage-dot {dot_class}" title="{stage["name"]}">{stage["icon"]}</div>'
+        for stage, dot_class in zip(stages, stage_states(current_stage_index, total_stages))
+    )
     
-    # Build dynamic styles for rotation and gradient
-    dynamic_styles = f"""
-    <style>
-    .wheel-outer-{current_stage_index} {{
-        transform: rotate({rotation}deg);
-    }}
-    .wheel-rim-{current_stage_index} {{
-        background: conic-gradient(
-            from 0deg,
-            #3498db 0deg,
-            #2ecc71 {progress_percent * 3.6}deg,
-            #95a5a6 {progress_percent * 3.6}deg,
-            #7f8c8d 360deg
-        );
-    }}
-    </style>
-    """
+    # Progress drives both the wheel rotation and the rim fill
+    wheel_angle = progress_percent * 3.6
     
-    # Render HTML with dynamic classes
     html_content = f"""
-    {dynamic_styles}
-    <div class="wheel-tracker-wrapper">
+    <style>{WHEEL_TRACKER_CSS}</style>
+    <div class="wheel-tracker-wrapper" style="--wheel-angle: {wheel_angle}deg;">
         <div class="wheel-container">
             <div class="wheel-wrapper">
-                <div class="wheel-outer wheel-outer-{current_stage_index}">
-                    <div class="wheel-rim wheel-rim-{current_stage_index}"></div>
+                <div class="wheel-outer">
+                    <div class="wheel-rim"></div>
                     <div class="wheel-center">
                         {current_stage['icon']}
                     </div>
@@ -394,213 +480,7 @@ def render_wheel_tracker(current_stage_index, stages):
 
 def apply_custom_css():
     """Apply custom CSS styling"""
-    st.markdown(f"""
-    <style>
-    [data-testid="stAppViewContainer"] {{
-        background-color: {PAGE_BG};
-    }}
-    .header-card {{
-        background-color: {PRIMARY};
-        color: white;
-        padding: 16px 24px;
-        border-radius: 12px;
-        font-size: 24px;
-        font-weight: 700;
-        text-align: center;
-        margin-bottom: 24px;
-    }}
-    .content-card {{
-        background-color: white;
-        padding: 16px 20px;
-        border-radius: 12px;
-        box-shadow: 0 6px 18px rgba(0,0,0,0.06);
-        margin-bottom: 16px;
-        color: {PRIMARY};
-    }}
-    .stButton>button {{
-        background-color: {ACCENT} !important;
-        color: white !important;
-        font-weight: 600;
-        border-radius: 8px;
-        border: none !important;
-        padding: 0.5rem 1rem;
-        font-size: 16px;
-    }}
-    .stButton>button:hover {{
-        background-color: #1873cc !important;
-    }}
-    .stFormSubmitButton>button {{
-        background-color: {ACCENT} !important;
-        color: white !important;
-        font-weight: 600;
-        border-radius: 8px;
-        border: none !important;
-        padding: 0.5rem 1rem;
-        font-size: 16px;
-    }}
-    .numberplate {{
-        background-color: #FFC600;
-        border: 4px solid #000000;
-        border-radius: 8px;
-        padding: 20px 32px;
-        font-size: 48px;
-        font-weight: 900;
-        color: #000000;
-        text-align: center;
-        margin: 24px auto;
-        letter-spacing: 8px;
-        box-shadow: 0 6px 16px rgba(0,0,0,0.25);
-        max-width: 500px;
-        font-family: 'Charles Wright', Arial, sans-serif;
-    }}
-    .badge {{
-        padding: 4px 10px;
-        border-radius: 12px;
-        color: white;
-        margin-right: 4px;
-        font-size: 12px;
-        display: inline-block;
-    }}
-    .badge-warning {{background-color: #ff9800;}}
-    .badge-error {{background-color: #f44336;}}
-    .badge-success {{background-color: #4caf50;}}
-    
-    /* Wheel Tracker Styles */
-    .wheel-tracker-wrapper {{
-        width: 100%;
-        margin: 20px 0;
-    }}
-    
-    @keyframes pulse {{
-        0%, 100% {{ transform: scale(1); }}
-        50% {{ transform: scale(1.05); }}
-    }}
-    
-    .wheel-tracker-wrapper .wheel-container {{
-        display: flex;
-        flex-direction: column;
-        align-items: center;
-        justify-content: flex-start;
-        padding: 50px 30px 100px 30px;
-        background: linear-gradient(135deg, {PRIMARY} 0%, {ACCENT} 100%);
-        border-radius: 20px;
-        min-height: 750px;
-        overflow: hidden;
-        box-sizing: border-box;
-    }}
-    
-    .wheel-tracker-wrapper .wheel-wrapper {{
-        position: relative;
-        width: 280px;
-        height: 280px;
-        margin-bottom: 40px;
-        flex-shrink: 0;
-    }}
-    
-    .wheel-tracker-wrapper .wheel-outer {{
-        position: absolute;
-        width: 100%;
-        height: 100%;
-        border-radius: 50%;
-        background: linear-gradient(135deg, #2c3e50 0%, #34495e 100%);
-        box-shadow: 0 10px 40px rgba(0,0,0,0.3),
-                    inset 0 0 20px rgba(255,255,255,0.1);
-        transition: transform 1s ease-out;
-    }}
-    
-    .wheel-tracker-wrapper .wheel-rim {{
-        position: absolute;
-        width: 90%;
-        height: 90%;
-        top: 5%;
-        left: 5%;
-        border-radius: 50%;
-        box-shadow: inset 0 0 30px rgba(0,0,0,0.4);
-    }}
-    
-    .wheel-tracker-wrapper .wheel-center {{
-        position: absolute;
-        width: 50%;
-        height: 50%;
-        top: 25%;
-        left: 25%;
-        border-radius: 50%;
-        background: linear-gradient(135deg, #ecf0f1 0%, #bdc3c7 100%);
-        box-shadow: 0 5px 15px rgba(0,0,0,0.3),
-                    inset 0 0 10px rgba(255,255,255,0.5);
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        font-size: 48px;
-        animation: pulse 2s ease-in-out infinite;
-    }}
-    
-    .wheel-tracker-wrapper .progress-text {{
-        color: white;
-        text-align: center;
-        margin-bottom: 40px;
-        flex-shrink: 0;
-        width: 100%;
-    }}
-    
-    .wheel-tracker-wrapper .stage-name {{
-        font-size: 24px;
-        font-weight: 700;
-        margin-bottom: 5px;
-    }}
-    
-    .wheel-tracker-wrapper .progress-percent {{
-        font-size: 48px;
-        font-weight: 900;
-        margin-top: 10px;
-    }}
-    
-    .wheel-tracker-wrapper .stage-dots {{
-        display: flex;
-        justify-content: center;
-        align-items: center;
-        gap: 15px;
-        margin-top: 30px;
-        padding: 20px 30px 50px 30px;
-        flex-wrap: wrap;
-        flex-shrink: 0;
-        width: 100%;
-        box-sizing: border-box;
-    }}
-    
-    .wheel-tracker-wrapper .stage-dot {{
-        width: 50px;
-        height: 50px;
-        border-radius: 50%;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        font-size: 24px;
-        transition: all 0.3s ease;
-        border: 3px solid rgba(255,255,255,0.3);
-        flex-shrink: 0;
-        box-sizing: border-box;
-    }}
-    
-    .wheel-tracker-wrapper .stage-dot.completed {{
-        background-color: #4caf50;
-        border-color: #4caf50;
-        box-shadow: 0 0 20px rgba(76, 175, 80, 0.5);
-    }}
-    
-    .wheel-tracker-wrapper .stage-dot.current {{
-        background-color: white;
-        border-color: white;
-        animation: pulse 1.5s ease-in-out infinite;
-        box-shadow: 0 0 30px rgba(255, 255, 255, 0.8);
-    }}
-    
-    .wheel-tracker-wrapper .stage-dot.pending {{
-        background-color: rgba(255,255,255,0.2);
-        border-color: rgba(255,255,255,0.3);
-    }}
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 # ============================================================================
 # UI COMPONENTS
@@ -608,120 +488,94 @@ def apply_custom_css():
 
 def render_header():
     """Render the application header"""
-    st.markdown(f"""
-    <div class='header-card' style='background: linear-gradient(135deg, {PRIMARY} 0%, #1a4d7a 100%);'>
-        <div style='display: flex; align-items: center; justify-content: center;'>
-            <div style='text-align: center;'>
-                <div style='font-size: 28px; font-weight: 700;'>Sytner TradeSnap</div>
-                <div style='font-size: 14px; opacity: 0.9; font-weight: 400;'>Snap it. Value it. Done.</div>
-            </div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(HEADER_HTML, unsafe_allow_html=True)
 
 def render_reset_button():
     """Render reset button when on summary page"""
     if st.session_state.show_summary:
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
-            if st.button("New Vehicle Lookup", use_container_width=True):
-                reset_all_state()
-                st.rerun()
+            st.button("New Vehicle Lookup", use_container_width=True, on_click=reset_all_state)
 
 def render_status_badges(history_flags, open_recalls):
     """Render status badges for vehicle"""
-    flags_html = "<p><strong>Status Flags:</strong> "
-    flag_list = []
-    
-    if history_flags.get("write_off"):
-        flag_list.append('<span class="badge badge-error">Write-off</span>')
-    if history_flags.get("theft"):
-        flag_list.append('<span class="badge badge-error">Theft Record</span>')
-    if history_flags.get("mileage_anomaly"):
-        flag_list.append('<span class="badge badge-warning">Mileage Anomaly</span>')
-    if open_recalls:
-        flag_list.append(f'<span class="badge badge-warning">{open_recalls} Open Recall(s)</span>')
-    
-    if not flag_list:
-        flag_list.append('<span class="badge badge-success">No Issues Found</span>')
-
-    flags_html += " ".join(flag_list) + "</p>"
-    st.markdown(flags_html, unsafe_allow_html=True)
+    st.markdown(status_badges_html(
+        bool(history_flags.get("write_off")),
+        bool(history_flags.get("theft")),
+        bool(history_flags.get("mileage_anomaly")),
+        open_recalls,
+    ), unsafe_allow_html=True)
 
 def render_vehicle_summary(vehicle, mot_tax, history_flags, open_recalls):
     """Render the main vehicle summary card"""
-    st.markdown("<div class='content-card'>", unsafe_allow_html=True)
-    st.markdown("<h4>Vehicle Summary</h4>", unsafe_allow_html=True)
-    
-    col1, col2 = st.columns(2)
-    with col1:
-        st.markdown(f"**Make & Model:** {vehicle['make']} {vehicle['model']}")
-        st.markdown(f"**Year:** {vehicle['year']}")
-        st.markdown(f"**Mileage:** {vehicle['mileage']:,} miles")
-    with col2:
-        st.markdown(f"**VIN:** {vehicle['vin']}")
-        st.markdown(f"**Next MOT:** {mot_tax['mot_next_due']}")
-        st.markdown(f"**Tax Expiry:** {mot_tax['tax_expiry']}")
-
-    st.markdown("---")
-    render_status_badges(history_flags, open_recalls)
+    with st.container(border=True):
+        st.markdown("#### Vehicle Summary")
     
-    if history_flags.get("note"):
-        st.info(f"ℹ️ {history_flags['note']}")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown(
+                f"**Make & Model:** {vehicle['make']} {vehicle['model']}\n\n"
+                f"**Year:** {vehicle['year']}\n\n"
+                f"**Mileage:** {vehicle['mileage']:,} miles"
+            )
+        with col2:
+            st.markdown(
+                f"**VIN:** {vehicle['vin']}\n\n"
+                f"**Next MOT:** {mot_tax['mot_next_due']}\n\n"
+                f"**Tax Expiry:** {mot_tax['tax_expiry']}"
+            )
+
+        st.divider()
+        render_status_badges(history_flags, open_recalls)
     
-    st.markdown("</div>", unsafe_allow_html=True)
+        if history_flags.get("note"):
+            st.info(f"ℹ️ {history_flags['note']}")
 
 
 # ============================================================================
 # PAGE RENDERERS - CONTINUE FROM PART 1
 # ============================================================================
 
+def submit_registration():
+    """Form callback: start a lookup if the entered registration is valid"""
+    manual_reg = st.session_state.manual_reg
+    if manual_reg and validate_registration(manual_reg):
+        st.session_state.reg = clean_registration(manual_reg)
+        st.session_state.image = None
+        st.session_state.show_summary = True
+
 def render_input_page():
     """Render the vehicle input page"""
     
-    st.markdown(f"""
-    <div style='background: linear-gradient(135deg, {PRIMARY} 0%, {ACCENT} 100%); 
-                padding: 40px 24px; border-radius: 16px; margin-bottom: 32px; text-align: center;'>
-        <h1 style='color: white; margin: 0 0 16px 0; font-size: 36px;'>Instant Trade-In Valuation</h1>
-        <p style='color: rgba(255,255,255,0.95); font-size: 18px; margin: 0;'>
-            Get competitive offers in seconds
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(INPUT_HERO_HTML, unsafe_allow_html=True)
     
     st.markdown("### Enter Registration")
-    manual_reg = st.text_input("Registration", placeholder="AB12 CDE", label_visibility="collapsed")
-    
-    if st.button("🔍 Look Up Vehicle", disabled=not manual_reg, type="primary", use_container_width=True):
-        if validate_registration(manual_reg):
-            st.session_state.reg = manual_reg.strip().upper().replace(" ", "")
-            st.session_state.image = None
-            st.session_state.show_summary = True
-            st.rerun()
-        else:
-            st.error("❌ Please enter a valid registration")
-
+    # Form so typing doesn't rerun the script; only the submit does
+    with st.form("reg_form", clear_on_submit=False, border=False):
+        st.text_input("Registration", placeholder="AB12 CDE", label_visibility="collapsed", key="manual_reg")
+        submitted = st.form_submit_button("🔍 Look Up Vehicle", type="primary", use_container_width=True,
+                                          on_click=submit_registration)
+    
+    # A valid submission switches to the summary page before this page is drawn
+    if submitted:
+        st.error("❌ Please enter a valid registration")
+
+# Fragment: the garage selector and contact forms only rerun this section
+@st.fragment
 def render_sytner_buyers(vehicle, reg):
     """Render location-based buyer assignment"""
-    buyers = get_sytner_buyers()
-    
     st.markdown("##### 📍 Your Location")
     selected_garage = st.selectbox("Choose nearest location", GARAGES, key="garage_selector")
     
     garage_name = selected_garage.split(" - ")[0]
     
-    allocated_buyer = None
-    for buyer in buyers:
-        if garage_name in buyer['covers_garages']:
-            allocated_buyer = buyer
-            break
+    buyer = get_buyers_by_garage().get(garage_name)
     
-    if allocated_buyer:
-        buyer = allocated_buyer
-        is_specialty = any(spec.lower() in vehicle['model'].lower() for spec in buyer['specialties'])
+    if buyer:
+        model_lower = vehicle['model'].lower()
         
         st.markdown(f"""
-        <div style='background: linear-gradient(135deg, {PRIMARY} 0%, {ACCENT} 100%); 
+        <div style='background: var(--brand-gradient); 
                     padding: 14px 18px; border-radius: 10px; margin: 16px 0; color: white;'>
             <div style='font-size: 16px; font-weight: 700;'>{buyer['name']}</div>
             <div style='font-size: 12px; opacity: 0.85; margin-top: 4px;'>
@@ -731,17 +585,15 @@ def render_sytner_buyers(vehicle, reg):
         """, unsafe_allow_html=True)
         
         # Specialties
-        st.markdown("<div style='margin: 12px 0;'>", unsafe_allow_html=True)
-        for specialty in buyer['specialties']:
-            badge_color = "#4caf50" if specialty.lower() in vehicle['model'].lower() else "#e0e0e0"
-            text_color = "white" if specialty.lower() in vehicle['model'].lower() else "#666"
-            st.markdown(f'<span style="display: inline-block; background-color: {badge_color}; color: {text_color}; padding: 3px 8px; border-radius: 10px; margin-right: 4px; font-size: 12px;">{specialty}</span>', unsafe_allow_html=True)
-        st.markdown("</div>", unsafe_allow_html=True)
+        badges_html = "".join(
+            SPECIALTY_BADGE_TEMPLATES[specialty.lower() in model_lower].format(specialty)
+            for specialty in buyer['specialties']
+        )
+        st.markdown(f"<div style='margin: 12px 0;'>{badges_html}</div>", unsafe_allow_html=True)
         
         # Contact button
-        if st.button(f"📲 Contact {buyer['name'].split()[0]}", key=f"ping_{buyer['email']}"):
-            st.session_state[f"ping_form_{buyer['email']}"] = True
-            st.rerun()
+        st.button(f"📲 Contact {buyer['name'].split()[0]}", key=f"ping_{buyer['email']}",
+                  on_click=set_state, args=(f"ping_form_{buyer['email']}", True))
         
         # Ping form
         if st.session_state.get(f"ping_form_{buyer['email']}", False):
@@ -761,208 +613,67 @@ def render_sytner_buyers(vehicle, reg):
                 with col_a:
                     submitted = st.form_submit_button("✅ Send", type="primary")
                 with col_b:
-                    cancelled = st.form_submit_button("❌ Cancel")
+                    st.form_submit_button("❌ Cancel", on_click=clear_state, args=(f"ping_form_{buyer['email']}",))
                 
                 if submitted and customer_name and customer_phone and customer_email:
                     ref = f"REQ-{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}"
                     st.success(f"✅ Request Sent! Reference: {ref}")
                     st.balloons()
                     del st.session_state[f"ping_form_{buyer['email']}"]
-                
-                if cancelled:
-                    del st.session_state[f"ping_form_{buyer['email']}"]
-                    st.rerun()
 
-def render_market_trends(vehicle):
+def render_market_trends(current_value, today):
     """Display market trends"""
     st.markdown("#### 📊 Market Intelligence")
     
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.markdown(f"""
-        <div style='background: linear-gradient(135deg, #4caf50 0%, #45a049 100%); 
-                    padding: 20px; border-radius: 12px; text-align: center; color: white;'>
-            <div style='font-size: 32px; font-weight: 700;'>HIGH</div>
-            <div style='font-size: 14px; margin-top: 8px;'>Demand Level</div>
-        </div>
-        """, unsafe_allow_html=True)
-    with col2:
-        st.markdown(f"""
-        <div style='background: linear-gradient(135deg, {ACCENT} 0%, #1873cc 100%); 
-                    padding: 20px; border-radius: 12px; text-align: center; color: white;'>
-            <div style='font-size: 32px; font-weight: 700;'>12</div>
-            <div style='font-size: 14px; margin-top: 8px;'>Days to sell</div>
-        </div>
-        """, unsafe_allow_html=True)
-    with col3:
-        st.markdown("""
-        <div style='background: linear-gradient(135deg, #ff9800 0%, #f57c00 100%); 
-                    padding: 20px; border-radius: 12px; text-align: center; color: white;'>
-            <div style='font-size: 32px; font-weight: 700;'>87%</div>
-            <div style='font-size: 14px; margin-top: 8px;'>Of asking price</div>
-        </div>
-        """, unsafe_allow_html=True)
+    st.markdown(MARKET_STATS_HTML, unsafe_allow_html=True)
     
-    st.markdown("---")
+    st.divider()
     st.markdown("##### 📈 6-Month Price Forecast")
     
-    current_value = estimate_value(vehicle["make"], vehicle["model"], vehicle["year"], vehicle["mileage"])
-    
-    for i in range(1, 7):
-        month_date = datetime.date.today() + datetime.timedelta(days=30*i)
-        depreciation = -2.5 * i
-        projected_value = int(current_value * (1 + depreciation / 100))
-        
-        st.markdown(f"""
-        <div style='padding: 8px 0; border-bottom: 1px solid #ddd;'>
-            <div style='display: flex; justify-content: space-between;'>
-                <span>{month_date.strftime("%b %Y")}</span>
-                <span>
-                    <strong>£{projected_value:,}</strong>
-                    <span style='color: #f44336; font-size: 13px; margin-left: 8px;'>({depreciation:.1f}%)</span>
-                </span>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+    st.markdown(price_forecast_html(current_value, today), unsafe_allow_html=True)
 
 def render_upgrade_options(vehicle, trade_in_value):
     """Show potential upgrade options"""
     st.markdown("### 🚗 Potential Upgrades")
     
-    upgrade_options = [
-        {"model": "BMW 3 Series 320d M Sport", "year": 2023, "price": 38000},
-        {"model": "BMW X3 xDrive20d M Sport", "year": 2023, "price": 48000},
-        {"model": "BMW 5 Series 530e M Sport", "year": 2024, "price": 52000},
-    ]
-    
-    for car in upgrade_options:
-        remaining_amount = car['price'] - trade_in_value
-        trade_in_percentage = int((trade_in_value / car['price']) * 100)
-        monthly_payment = int(remaining_amount * 0.023)
-        
-        border_color = "#4caf50" if trade_in_percentage >= 40 else ACCENT if trade_in_percentage >= 25 else "#ff9800"
-        
-        st.markdown(f"""
-        <div style='background-color: #f8f9fa; padding: 16px 20px; border-radius: 12px; margin: 12px 0; 
-                    border-left: 6px solid {border_color};'>
-            <div style='display: flex; justify-content: space-between; align-items: center;'>
-                <div>
-                    <div style='font-size: 18px; font-weight: 700; color: {PRIMARY};'>
-                        🚘 {car['model']}
-                    </div>
-                    <div style='font-size: 13px; color: #666;'>{car['year']} Model • £{car['price']:,}</div>
-                </div>
-                <div style='text-align: right;'>
-                    <div style='background-color: {border_color}; color: white; padding: 4px 10px; 
-                                border-radius: 16px; font-weight: 700; font-size: 13px;'>
-                        {trade_in_percentage}% Covered
-                    </div>
-                </div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        col_a, col_b, col_c = st.columns(3)
-        with col_a:
-            st.markdown(f"""
-            <div style='background-color: white; padding: 12px; border-radius: 8px; text-align: center;'>
-                <div style='font-size: 10px; color: #999; text-transform: uppercase; margin-bottom: 6px;'>
-                    TRADE-IN
-                </div>
-                <div style='font-size: 20px; font-weight: 700; color: #4caf50;'>
-                    £{trade_in_value:,}
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-        with col_b:
-            st.markdown(f"""
-            <div style='background-color: white; padding: 12px; border-radius: 8px; text-align: center;'>
-                <div style='font-size: 10px; color: #999; text-transform: uppercase; margin-bottom: 6px;'>
-                    YOU PAY
-                </div>
-                <div style='font-size: 20px; font-weight: 700; color: {PRIMARY};'>
-                    £{remaining_amount:,}
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-        with col_c:
-            st.markdown(f"""
-            <div style='background-color: white; padding: 12px; border-radius: 8px; text-align: center;'>
-                <div style='font-size: 10px; color: #999; text-transform: uppercase; margin-bottom: 6px;'>
-                    MONTHLY
-                </div>
-                <div style='font-size: 20px; font-weight: 700; color: {ACCENT};'>
-                    £{monthly_payment}/mo
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+    st.markdown(upgrade_options_html(UPGRADE_OPTIONS, trade_in_value), unsafe_allow_html=True)
 
 def render_deal_accelerator(base_value):
     """Render deal accelerator bonuses"""
     st.markdown("### 🚀 Deal Bonuses")
     
-    col1, col2 = st.columns(2)
-    with col1:
-        st.markdown("""
-        <div style='background-color: #e8f5e9; padding: 24px; border-radius: 12px; border-left: 6px solid #4caf50;'>
-            <div style='font-size: 20px; font-weight: 600; color: #2e7d32; margin-bottom: 12px;'>
-                📦 Stock Priority Bonus
-            </div>
-            <div style='font-size: 36px; font-weight: 900; color: #1b5e20; margin-bottom: 8px;'>+£500</div>
-            <div style='font-size: 14px; color: #666;'>We need this model in stock!</div>
-        </div>
-        """, unsafe_allow_html=True)
-    with col2:
-        st.markdown(f"""
-        <div style='background-color: #e3f2fd; padding: 24px; border-radius: 12px; border-left: 6px solid {ACCENT};'>
-            <div style='font-size: 20px; font-weight: 600; color: #1565c0; margin-bottom: 12px;'>
-                ⚡ Same-Day Completion
-            </div>
-            <div style='font-size: 36px; font-weight: 900; color: #0d47a1; margin-bottom: 8px;'>+£200</div>
-            <div style='font-size: 14px; color: #666;'>If completed today</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
     total_with_bonuses = base_value + 700
     
-    st.markdown(f"""
-    <div style='background-color: #fff3cd; padding: 24px; border-radius: 12px; border-left: 4px solid #ffc107; margin-top: 24px;'>
-        <div style='text-align: center;'>
-            <div style='font-size: 16px; color: #666; margin-bottom: 8px;'><strong>Maximum Potential Offer</strong></div>
-            <div style='font-size: 42px; font-weight: 900; color: {PRIMARY};'>£{total_with_bonuses:,}</div>
-            <div style='font-size: 14px; color: #666; margin-top: 8px;'><em>Base value + all bonuses • Valid for 48 hours</em></div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(deal_bonuses_html(total_with_bonuses, VALUATION_VALIDITY_HOURS), unsafe_allow_html=True)
 
 def render_mot_history(mot_history):
     """Render MOT history"""
+    record_rows = []
     for record in mot_history:
-        result_icon = "✅" if record['result'] == "Pass" else "⚠️"
-        result_color = "#4caf50" if record['result'] == "Pass" else "#ff9800"
-        st.markdown(f"""
+        result_icon, result_color = MOT_RESULT_STYLES.get(record['result'], MOT_RESULT_DEFAULT_STYLE)
+        record_rows.append(f"""
         <div style='background-color: #f5f5f5; padding: 16px; border-radius: 8px; margin-bottom: 12px; border-left: 4px solid {result_color};'>
             <div style='display: flex; justify-content: space-between; align-items: center;'>
                 <div><strong>{result_icon} {record['result']}</strong> - {record['date']}</div>
                 <div style='color: #666;'>{record['mileage']:,} miles</div>
             </div>
         </div>
-        """, unsafe_allow_html=True)
+        """)
+    st.markdown("".join(record_rows), unsafe_allow_html=True)
 
-def render_recalls_section(recalls, vehicle, reg):
+# Fragment: opening/submitting a booking form only reruns this section
+@st.fragment
+def render_recalls_section(recalls, open_recalls, vehicle, reg, today):
     """Render recalls management"""
     if not recalls:
         st.success("✅ No outstanding recalls found for this vehicle")
         return
     
-    open_count = sum(1 for r in recalls if r["open"])
-    if open_count > 0:
-        st.warning(f"⚠️ {open_count} open recall(s) require attention")
+    if open_recalls > 0:
+        st.warning(f"⚠️ {open_recalls} open recall(s) require attention")
     
     for recall in recalls:
-        status_icon = "🔴" if recall['open'] else "✅"
-        status_text = "OPEN - ACTION REQUIRED" if recall['open'] else "COMPLETED"
-        status_color = "#f44336" if recall['open'] else "#4caf50"
+        status_icon, status_text, status_color = RECALL_STATUS_STYLES[bool(recall['open'])]
         
         st.markdown(f"""
         <div style='background-color: #f5f5f5; padding: 16px; border-radius: 8px; margin-bottom: 16px; border-left: 4px solid {status_color};'>
@@ -976,16 +687,15 @@ def render_recalls_section(recalls, vehicle, reg):
         
         if recall['open']:
             recall_key = f"{recall['id']}_{reg}"
-            if st.button(f"📅 Book Repair for {recall['id']}", key=f"book_recall_{recall_key}"):
-                st.session_state.booking_forms[recall_key] = True
-                st.rerun()
+            st.button(f"📅 Book Repair for {recall['id']}", key=f"book_recall_{recall_key}",
+                      on_click=set_state, args=("open_booking_form", recall_key))
             
-            if st.session_state.booking_forms.get(recall_key):
+            if st.session_state.open_booking_form == recall_key:
                 with st.form(key=f"recall_form_{recall_key}"):
                     col1, col2 = st.columns(2)
                     with col1:
                         garage = st.selectbox("Garage", GARAGES)
-                        booking_date = st.date_input("Date", min_value=datetime.date.today())
+                        booking_date = st.date_input("Date", min_value=today)
                     with col2:
                         time_slot = st.selectbox("Time", TIME_SLOTS)
                         customer_name = st.text_input("Name *")
@@ -996,65 +706,43 @@ def render_recalls_section(recalls, vehicle, reg):
                     with col_x:
                         submitted = st.form_submit_button("✅ Confirm", type="primary")
                     with col_y:
-                        cancelled = st.form_submit_button("❌ Cancel")
+                        st.form_submit_button("❌ Cancel", on_click=set_state, args=("open_booking_form", None))
                     
                     if submitted and customer_name and validate_phone(customer_phone):
                         booking_ref = f"RCL-{recall['id']}-{datetime.datetime.now().strftime('%Y%m%d%H%M')}"
                         st.success(f"✅ Booking Confirmed! Reference: {booking_ref}")
-                        del st.session_state.booking_forms[recall_key]
+                        st.session_state.open_booking_form = None
                         st.balloons()
-                    
-                    if cancelled:
-                        del st.session_state.booking_forms[recall_key]
-                        st.rerun()
 
 def render_summary_page():
     """Render the complete vehicle summary page with all tabs"""
     reg = st.session_state.reg
     image = st.session_state.image
+    today = datetime.date.today()
 
     if image:
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
-            st.image(ImageOps.exif_transpose(Image.open(image)), use_container_width=True)
+            st.image(load_oriented_image(image.getvalue()), use_container_width=True)
 
-    st.markdown(f"<div class='numberplate'>{reg}</div>", unsafe_allow_html=True)
+    st.markdown(NUMBERPLATE_TEMPLATE.format(reg), unsafe_allow_html=True)
 
     try:
         with st.spinner("🔄 Fetching vehicle information..."):
-            vehicle = lookup_vehicle_basic(reg)
-            mot_tax = lookup_mot_and_tax(reg)
-            recalls = lookup_recalls(reg)
-            history_flags = get_history_flags(reg)
+            vehicle, mot_tax, recalls, history_flags = lookup_all(reg, today)
     except Exception as e:
         st.error(f"⚠️ Error fetching vehicle data: {str(e)}")
         st.stop()
 
-    open_recalls = sum(1 for r in recalls if r["open"])
+    open_recalls = sum(r["open"] for r in recalls)
     
     render_vehicle_summary(vehicle, mot_tax, history_flags, open_recalls)
     
-    # Quick Market Snapshot
-    st.markdown(f"""
-    <div style='background: linear-gradient(135deg, {PRIMARY} 0%, {ACCENT} 100%); 
-                padding: 20px; border-radius: 12px; margin-bottom: 20px; color: white;'>
-        <h4 style='margin: 0 0 12px 0;'>📊 Quick Market Snapshot</h4>
-        <div style='display: flex; justify-content: space-around; flex-wrap: wrap; gap: 16px;'>
-            <div style='text-align: center;'>
-                <div style='font-size: 24px; font-weight: 700;'>HIGH</div>
-                <div style='font-size: 13px; opacity: 0.9;'>Demand</div>
-            </div>
-            <div style='text-align: center;'>
-                <div style='font-size: 24px; font-weight: 700;'>12 days</div>
-                <div style='font-size: 13px; opacity: 0.9;'>To Sell</div>
-            </div>
-            <div style='text-align: center;'>
-                <div style='font-size: 24px; font-weight: 700;'>↑ +5%</div>
-                <div style='font-size: 13px; opacity: 0.9;'>Price Trend</div>
-            </div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(MARKET_SNAPSHOT_HTML, unsafe_allow_html=True)
+    
+    # Shared by the valuation, network, market and journey sections
+    base_value = estimate_value(vehicle["make"], vehicle["model"], vehicle["year"], vehicle["mileage"], "good",
+                                today.year)
     
     # Main tabbed interface
     tab1, tab2, tab3, tab4, tab5 = st.tabs([
@@ -1068,70 +756,42 @@ def render_summary_page():
     with tab1:
         st.markdown("### 📋 MOT Test History")
         render_mot_history(mot_tax['mot_history'])
-        st.markdown("---")
+        st.divider()
         st.markdown("### ⚠️ Safety Recalls Management")
-        render_recalls_section(recalls, vehicle, reg)
+        render_recalls_section(recalls, open_recalls, vehicle, reg, today)
     
     with tab2:
         st.markdown("### 👤 Connect with Sytner Vehicle Buyer")
         render_sytner_buyers(vehicle, reg)
     
     with tab3:
-        base_value = estimate_value(vehicle["make"], vehicle["model"], vehicle["year"], vehicle["mileage"], "good")
         st.markdown("### 💰 Estimated Trade-In Value")
         
-        st.markdown(f"""
-        <div style='background: linear-gradient(135deg, {PRIMARY} 0%, {ACCENT} 100%); 
-                    padding: 28px; border-radius: 12px; text-align: center; color: white; margin-bottom: 24px;'>
-            <div style='font-size: 16px; opacity: 0.9; margin-bottom: 8px;'>Estimated Vehicle Value</div>
-            <div style='font-size: 48px; font-weight: 900; margin: 12px 0;'>£{base_value:,}</div>
-            <div style='font-size: 14px; opacity: 0.85;'>
-                {vehicle['year']} {vehicle['make']} {vehicle['model']}
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(valuation_card_html(base_value, vehicle['year'], vehicle['make'], vehicle['model']),
+                    unsafe_allow_html=True)
         
-        st.markdown("---")
+        st.divider()
         render_upgrade_options(vehicle, base_value)
         
-        st.markdown("---")
+        st.divider()
         render_deal_accelerator(base_value)
     
     with tab4:
         st.markdown("### 🏆 Best Offers Across Sytner Network")
         total_value = base_value + 700
         
-        network_data = [
-            {"location": "Sytner BMW Solihull", "offer": total_value, "badge": "🏆 Best Offer"},
-            {"location": "Sytner BMW Birmingham", "offer": total_value - 200, "badge": ""},
-            {"location": "Sytner BMW Coventry", "offer": total_value - 400, "badge": ""},
-        ]
-        
-        for loc in network_data:
-            badge_html = f"<span style='color: #ffa726; margin-left: 8px;'>{loc['badge']}</span>" if loc['badge'] else ""
-            st.markdown(f"""
-            <div style='background-color: #f8f9fa; padding: 16px 20px; border-radius: 8px; margin: 12px 0; 
-                        display: flex; justify-content: space-between; align-items: center; border-left: 4px solid {ACCENT};'>
-                <div>
-                    <strong style='font-size: 16px;'>{loc['location']}</strong>{badge_html}
-                </div>
-                <div style='text-align: right;'>
-                    <div style='font-size: 24px; font-weight: 700; color: {PRIMARY};'>£{loc['offer']:,}</div>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+        st.markdown(network_offers_html(NETWORK_OFFER_OFFSETS, total_value), unsafe_allow_html=True)
     
     with tab5:
-        render_market_trends(vehicle)
+        render_market_trends(base_value, today)
     
     # Customer Journey Creation Section
-    st.markdown("---")
+    st.divider()
     st.markdown("### ✨ Create Customer Journey")
     st.markdown("*Convert this trade-in into a tracked sale*")
     
-    if st.button("🚀 Start Customer Journey", use_container_width=True, type="primary"):
-        st.session_state.create_journey_mode = True
-        st.rerun()
+    st.button("🚀 Start Customer Journey", use_container_width=True, type="primary",
+              on_click=set_state, args=("create_journey_mode", True))
     
     if st.session_state.get('create_journey_mode', False):
         with st.form("journey_creation_form"):
@@ -1150,8 +810,8 @@ def render_summary_page():
                 deposit_amount = st.number_input("Deposit Amount (£)", min_value=0, value=1000, step=100)
                 collection_date = st.date_input(
                     "Expected Collection Date",
-                    min_value=datetime.date.today(),
-                    value=datetime.date.today() + datetime.timedelta(days=30)
+                    min_value=today,
+                    value=today + datetime.timedelta(days=30)
                 )
             with col4:
                 garage = st.selectbox("Collection Garage", GARAGES)
@@ -1161,15 +821,17 @@ def render_summary_page():
             with col_a:
                 submitted = st.form_submit_button("✅ Create Journey", use_container_width=True, type="primary")
             with col_b:
-                cancelled = st.form_submit_button("❌ Cancel", use_container_width=True)
+                st.form_submit_button("❌ Cancel", use_container_width=True,
+                                      on_click=set_state, args=("create_journey_mode", False))
             
             if submitted:
                 if customer_name and customer_email and customer_phone:
                     tracking_id = generate_tracking_id()
+                    created_at = datetime.datetime.now().isoformat(timespec="seconds")
                     
                     journey = {
                         "tracking_id": tracking_id,
-                        "created_date": datetime.datetime.now().isoformat(),
+                        "created_date": created_at,
                         "customer": {
                             "name": customer_name,
                             "email": customer_email,
@@ -1179,14 +841,14 @@ def render_summary_page():
                         "vehicle": vehicle,
                         "financial": {
                             "deposit": deposit_amount,
-                            "trade_in_value": estimate_value(vehicle["make"], vehicle["model"], vehicle["year"], vehicle["mileage"], "good")
+                            "trade_in_value": base_value
                         },
                         "garage": garage,
                         "salesperson": salesperson_name,
                         "collection_date": collection_date.isoformat(),
                         "current_stage": 0,
                         "stage_history": {
-                            SALES_STAGES[0]["name"]: datetime.datetime.now().isoformat()
+                            SALES_STAGES[0]["name"]: created_at
                         }
                     }
                     
@@ -1207,10 +869,6 @@ def render_summary_page():
                     st.rerun()
                 else:
                     st.error("⚠️ Please fill in all required fields")
-            
-            if cancelled:
-                st.session_state.create_journey_mode = False
-                st.rerun()
     
     # Show share section after journey is created (outside the form)
     if st.session_state.get('journey_created'):
@@ -1227,7 +885,7 @@ def render_summary_page():
         st.code(journey_info['tracking_url'], language=None)
         
         # Share tracking link section (now outside the form)
-        st.markdown("---")
+        st.divider()
         st.markdown("### 📱 Share Tracking Link with Customer")
         
         share_method = st.radio(
@@ -1267,9 +925,7 @@ Sytner BMW Team"""
                         st.success(f"✅ Email sent to {email_to}")
                         st.info("💡 **Note:** In production, integrate with SendGrid, AWS SES, or your email service")
                 with col_y:
-                    if st.form_submit_button("Done"):
-                        del st.session_state.journey_created
-                        st.rerun()
+                    st.form_submit_button("Done", on_click=clear_state, args=("journey_created",))
         
         elif share_method == "📱 SMS/Text":
             with st.form("sms_tracking_form"):
@@ -1288,9 +944,7 @@ Sytner BMW Team"""
                         st.success(f"✅ SMS sent to {sms_to}")
                         st.info("💡 **Note:** In production, integrate with Twilio, AWS SNS, or your SMS service")
                 with col_y:
-                    if st.form_submit_button("Done"):
-                        del st.session_state.journey_created
-                        st.rerun()
+                    st.form_submit_button("Done", on_click=clear_state, args=("journey_created",))
         
         else:  # Copy Link
             st.markdown("#### 📋 Copy & Share Link")
@@ -1307,9 +961,7 @@ qr = qrcode.make('{journey_info['tracking_url']}')
 qr.save('tracking_qr.png')
                     """)
             with col2:
-                if st.button("✅ Done Sharing"):
-                    del st.session_state.journey_created
-                    st.rerun()
+                st.button("✅ Done Sharing", on_click=clear_state, args=("journey_created",))
 
 # ============================================================================
 # SALES PIPELINE PAGE
@@ -1323,17 +975,22 @@ def render_sales_pipeline_page():
     sales_data = load_sales_data()
     
     if sales_data:
+        # One pass over the records for both summed metrics
+        total_value = 0
+        needs_attention = 0
+        for sale in sales_data:
+            total_value += sale['financial'].get('total_price', 0)
+            needs_attention += sale['status'].get('needs_attention', False)
+        
         col1, col2, col3 = st.columns(3)
         with col1:
             st.metric("Total Active Sales", len(sales_data))
         with col2:
-            total_value = sum(sale['financial'].get('total_price', 0) for sale in sales_data)
-            st.metric("Pipeline Value", f"£{total_value:,}")
+            st.metric("Pipeline Value", format_gbp(total_value))
         with col3:
-            needs_attention = sum(1 for sale in sales_data if sale['status'].get('needs_attention', False))
             st.metric("Needs Attention", needs_attention)
         
-        st.markdown("---")
+        st.divider()
         st.markdown("### Recent Sales")
         
         for sale in sales_data[:15]:
@@ -1349,7 +1006,7 @@ def render_sales_pipeline_page():
                 with col2:
                     st.write(f"**Vehicle:** {sale['vehicle']['year']} {sale['vehicle']['make']} {sale['vehicle']['model']}")
                     st.write(f"**Registration:** {sale['vehicle']['registration']}")
-                    st.write(f"**Total Price:** £{sale['financial']['total_price']:,}")
+                    st.write(f"**Total Price:** {format_gbp(sale['financial']['total_price'])}")
                 
                 progress = sale['pipeline']['progress_percentage'] / 100
                 st.progress(progress)
@@ -1419,16 +1076,9 @@ def render_customer_tracker_page():
             st.markdown("### 📅 Journey Timeline")
             current_stage_idx = journey.get('current_stage', 0)
             
-            for idx, stage in enumerate(SALES_STAGES):
-                if idx < current_stage_idx:
-                    status = "✅ Completed"
-                    status_color = "#4caf50"
-                elif idx == current_stage_idx:
-                    status = "📍 Current Stage"
-                    status_color = ACCENT
-                else:
-                    status = "⏳ Upcoming"
-                    status_color = "#bbb"
+            states = stage_states(current_stage_idx, len(SALES_STAGES))
+            for idx, (stage, state) in enumerate(zip(SALES_STAGES, states)):
+                status, status_color = STAGE_TIMELINE_STYLES[state]
                 
                 st.markdown(f"""
                 <div style='background-color: #f8f9fa; padding: 16px; border-radius: 8px; 
@@ -1447,8 +1097,9 @@ def render_customer_tracker_page():
             st.info("📞 **Questions?** Contact your salesperson or visit your local Sytner dealership")
             
             # Share this tracker
-            st.markdown("---")
-            with st.expander("📤 Share This Tracker", expanded=False):
+            st.divider()
+            # Toggle rather than expander so the body is only built when shown
+            if st.toggle("📤 Share This Tracker", key=f"share_tracker_{tracking_id}"):
                 st.markdown("**Share your vehicle progress with family & friends**")
                 
                 share_url = f"https://your-app.streamlit.app/?track={journey['tracking_id']}"
@@ -1456,14 +1107,12 @@ def render_customer_tracker_page():
                 col_share1, col_share2 = st.columns(2)
                 
                 with col_share1:
-                    if st.button("📧 Email This Link", use_container_width=True):
-                        st.session_state[f"share_email_{tracking_id}"] = True
-                        st.rerun()
+                    st.button("📧 Email This Link", use_container_width=True,
+                              on_click=set_state, args=(f"share_email_{tracking_id}", True))
                 
                 with col_share2:
-                    if st.button("📱 SMS This Link", use_container_width=True):
-                        st.session_state[f"share_sms_{tracking_id}"] = True
-                        st.rerun()
+                    st.button("📱 SMS This Link", use_container_width=True,
+                              on_click=set_state, args=(f"share_sms_{tracking_id}", True))
                 
                 # Email share form
                 if st.session_state.get(f"share_email_{tracking_id}", False):
@@ -1480,9 +1129,8 @@ def render_customer_tracker_page():
                                     st.info("💡 Email service integration required in production")
                                     del st.session_state[f"share_email_{tracking_id}"]
                         with col_y:
-                            if st.form_submit_button("❌ Cancel"):
-                                del st.session_state[f"share_email_{tracking_id}"]
-                                st.rerun()
+                            st.form_submit_button("❌ Cancel", on_click=clear_state,
+                                                  args=(f"share_email_{tracking_id}",))
                 
                 # SMS share form
                 if st.session_state.get(f"share_sms_{tracking_id}", False):
@@ -1498,12 +1146,11 @@ def render_customer_tracker_page():
                                     st.info("💡 SMS service integration required in production")
                                     del st.session_state[f"share_sms_{tracking_id}"]
                         with col_y:
-                            if st.form_submit_button("❌ Cancel"):
-                                del st.session_state[f"share_sms_{tracking_id}"]
-                                st.rerun()
+                            st.form_submit_button("❌ Cancel", on_click=clear_state,
+                                                  args=(f"share_sms_{tracking_id}",))
                 
                 # Copy link option
-                st.markdown("---")
+                st.divider()
                 st.markdown("**Or copy this link:**")
                 st.code(share_url, language=None)
             
@@ -1546,7 +1193,7 @@ def main():
             label_visibility="collapsed"
         )
         
-        st.markdown("---")
+        st.divider()
         st.markdown("""
         **TradeSnap**: Vehicle lookup and trade-in valuation
         
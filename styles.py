@@ -0,0 +1,245 @@
+# styles.py
+# Colour palette and custom stylesheet for the Streamlit app.
+# Streamlit re-executes app.py on every rerun, so the CSS lives in an
+# imported module and is formatted (and minified) once per server process.
+
+import re
+
+PRIMARY = "#0b3b6f"
+ACCENT = "#1e90ff"
+PAGE_BG = "#e6f0fa"
+
+def minify_css(css):
+    """Strip comments and redundant whitespace from a stylesheet"""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    css = re.sub(r"\(\s+", "(", css)
+    css = re.sub(r"\s+\)", ")", css)
+    # #aabbcc -> #abc and 0.5 -> .5
+    css = re.sub(r"#([0-9a-f])\1([0-9a-f])\2([0-9a-f])\3(?![0-9a-f])", r"#\1\2\3", css, flags=re.I)
+    css = re.sub(r"(?<![\w.])0\.(\d)", r".\1", css)
+    return css.replace(";}", "}").strip()
+
+_CSS_RULES = f"""
+    :root {{
+        --brand-gradient: linear-gradient(135deg, {PRIMARY} 0%, {ACCENT} 100%);
+    }}
+    [data-testid="stAppViewContainer"] {{
+        background-color: {PAGE_BG};
+    }}
+    .header-card {{
+        background-color: {PRIMARY};
+        color: white;
+        padding: 16px 24px;
+        border-radius: 12px;
+        font-size: 24px;
+        font-weight: 700;
+        text-align: center;
+        margin-bottom: 24px;
+    }}
+    .stButton>button, .stFormSubmitButton>button {{
+        background-color: {ACCENT} !important;
+        color: white !important;
+        font-weight: 600;
+        border-radius: 8px;
+        border: none !important;
+        padding: 0.5rem 1rem;
+        font-size: 16px;
+    }}
+    .stButton>button:hover {{
+        background-color: #1873cc !important;
+    }}
+    .numberplate {{
+        background-color: #FFC600;
+        border: 4px solid #000000;
+        border-radius: 8px;
+        padding: 20px 32px;
+        font-size: 48px;
+        font-weight: 900;
+        color: #000000;
+        text-align: center;
+        margin: 24px auto;
+        letter-spacing: 8px;
+        box-shadow: 0 6px 16px rgba(0,0,0,0.25);
+        max-width: 500px;
+        font-family: 'Charles Wright', Arial, sans-serif;
+    }}
+    .badge {{
+        padding: 4px 10px;
+        border-radius: 12px;
+        color: white;
+        margin-right: 4px;
+        font-size: 12px;
+        display: inline-block;
+    }}
+    .badge-warning {{background-color: #ff9800;}}
+    .badge-error {{background-color: #f44336;}}
+    .badge-success {{background-color: #4caf50;}}
+    .specialty-badge {{
+        display: inline-block;
+        background-color: #e0e0e0;
+        color: #666;
+        padding: 3px 8px;
+        border-radius: 10px;
+        margin-right: 4px;
+        font-size: 12px;
+    }}
+    .specialty-badge.match {{
+        background-color: #4caf50;
+        color: white;
+    }}
+    """
+
+# Only the customer tracker page draws the wheel, so render_wheel_tracker
+# emits these rules instead of every page. Progress arrives as a
+# --wheel-angle custom property on the wrapper, so no per-stage rules.
+_WHEEL_TRACKER_RULES = """
+    .wheel-tracker-wrapper {
+        width: 100%;
+        margin: 20px 0;
+    }
+    
+    @keyframes pulse {
+        0%, 100% { transform: scale(1); }
+        50% { transform: scale(1.05); }
+    }
+    
+    .wheel-tracker-wrapper .wheel-container {
+        display: flex;
+        flex-direction: column;
+        align-items: center;
+        justify-content: flex-start;
+        padding: 50px 30px 100px 30px;
+        background: var(--brand-gradient);
+        border-radius: 20px;
+        min-height: 750px;
+        overflow: hidden;
+        box-sizing: border-box;
+    }
+    
+    .wheel-tracker-wrapper .wheel-wrapper {
+        position: relative;
+        width: 280px;
+        height: 280px;
+        margin-bottom: 40px;
+        flex-shrink: 0;
+    }
+    
+    .wheel-tracker-wrapper .wheel-outer {
+        position: absolute;
+        width: 100%;
+        height: 100%;
+        border-radius: 50%;
+        background: linear-gradient(135deg, #2c3e50 0%, #34495e 100%);
+        box-shadow: 0 10px 40px rgba(0,0,0,0.3),
+                    inset 0 0 20px rgba(255,255,255,0.1);
+        transform: rotate(var(--wheel-angle, 0deg));
+        transition: transform 1s ease-out;
+    }
+    
+    .wheel-tracker-wrapper .wheel-rim {
+        position: absolute;
+        width: 90%;
+        height: 90%;
+        top: 5%;
+        left: 5%;
+        border-radius: 50%;
+        background: conic-gradient(
+            from 0deg,
+            #3498db 0deg,
+            #2ecc71 var(--wheel-angle, 0deg),
+            #95a5a6 var(--wheel-angle, 0deg),
+            #7f8c8d 360deg
+        );
+        box-shadow: inset 0 0 30px rgba(0,0,0,0.4);
+    }
+    
+    .wheel-tracker-wrapper .wheel-center {
+        position: absolute;
+        width: 50%;
+        height: 50%;
+        top: 25%;
+        left: 25%;
+        border-radius: 50%;
+        background: linear-gradient(135deg, #ecf0f1 0%, #bdc3c7 100%);
+        box-shadow: 0 5px 15px rgba(0,0,0,0.3),
+                    inset 0 0 10px rgba(255,255,255,0.5);
+        display: flex;
+        align-items: center;
+        justify-content: center;
+        font-size: 48px;
+        animation: pulse 2s ease-in-out infinite;
+        will-change: transform;
+    }
+    
+    .wheel-tracker-wrapper .progress-text {
+        color: white;
+        text-align: center;
+        margin-bottom: 40px;
+        flex-shrink: 0;
+        width: 100%;
+    }
+    
+    .wheel-tracker-wrapper .stage-name {
+        font-size: 24px;
+        font-weight: 700;
+        margin-bottom: 5px;
+    }
+    
+    .wheel-tracker-wrapper .progress-percent {
+        font-size: 48px;
+        font-weight: 900;
+        margin-top: 10px;
+    }
+    
+    .wheel-tracker-wrapper .stage-dots {
+        display: flex;
+        justify-content: center;
+        align-items: center;
+        gap: 15px;
+        margin-top: 30px;
+        padding: 20px 30px 50px 30px;
+        flex-wrap: wrap;
+        flex-shrink: 0;
+        width: 100%;
+        box-sizing: border-box;
+    }
+    
+    .wheel-tracker-wrapper .stage-dot {
+        width: 50px;
+        height: 50px;
+        border-radius: 50%;
+        display: flex;
+        align-items: center;
+        justify-content: center;
+        font-size: 24px;
+        transition: background-color 0.3s ease, border-color 0.3s ease;
+        border: 3px solid rgba(255,255,255,0.3);
+        flex-shrink: 0;
+        box-sizing: border-box;
+    }
+    
+    .wheel-tracker-wrapper .stage-dot.completed {
+        background-color: #4caf50;
+        border-color: #4caf50;
+        box-shadow: 0 0 20px rgba(76, 175, 80, 0.5);
+    }
+    
+    .wheel-tracker-wrapper .stage-dot.current {
+        background-color: white;
+        border-color: white;
+        animation: pulse 1.5s ease-in-out infinite;
+        will-change: transform;
+        box-shadow: 0 0 30px rgba(255, 255, 255, 0.8);
+    }
+    
+    .wheel-tracker-wrapper .stage-dot.pending {
+        background-color: rgba(255,255,255,0.2);
+        border-color: rgba(255,255,255,0.3);
+    }
+    """
+
+CUSTOM_CSS = f"<style>{minify_css(_CSS_RULES)}</style>"
+WHEEL_TRACKER_CSS = minify_css(_WHEEL_TRACKER_RULES)
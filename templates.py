@@ -0,0 +1,245 @@
+# templates.py
+# Static HTML blocks, str.format templates and cached formatters for the
+# Streamlit app. Kept out of app.py (which Streamlit re-executes on every
+# rerun) so they are built once per server process.
+
+import datetime
+from functools import lru_cache
+
+from styles import PRIMARY, ACCENT
+
+HEADER_HTML = f"""
+    <div class='header-card' style='background: linear-gradient(135deg, {PRIMARY} 0%, #1a4d7a 100%);'>
+        <div style='display: flex; align-items: center; justify-content: center;'>
+            <div style='text-align: center;'>
+                <div style='font-size: 28px; font-weight: 700;'>Sytner TradeSnap</div>
+                <div style='font-size: 14px; opacity: 0.9; font-weight: 400;'>Snap it. Value it. Done.</div>
+            </div>
+        </div>
+    </div>
+    """
+
+INPUT_HERO_HTML = """
+    <div style='background: var(--brand-gradient); 
+                padding: 40px 24px; border-radius: 16px; margin-bottom: 32px; text-align: center;'>
+        <h1 style='color: white; margin: 0 0 16px 0; font-size: 36px;'>Instant Trade-In Valuation</h1>
+        <p style='color: rgba(255,255,255,0.95); font-size: 18px; margin: 0;'>
+            Get competitive offers in seconds
+        </p>
+    </div>
+    """
+
+NUMBERPLATE_TEMPLATE = "<div class='numberplate'>{}</div>"
+
+# Buyer specialty badge, keyed by whether it matches the vehicle's model
+SPECIALTY_BADGE_TEMPLATES = {
+    True: '<span class="specialty-badge match">{}</span>',
+    False: '<span class="specialty-badge">{}</span>',
+}
+
+MARKET_SNAPSHOT_HTML = """
+    <div style='background: var(--brand-gradient); 
+                padding: 20px; border-radius: 12px; margin-bottom: 20px; color: white;'>
+        <h4 style='margin: 0 0 12px 0;'>📊 Quick Market Snapshot</h4>
+        <div style='display: flex; justify-content: space-around; flex-wrap: wrap; gap: 16px;'>
+            <div style='text-align: center;'>
+                <div style='font-size: 24px; font-weight: 700;'>HIGH</div>
+                <div style='font-size: 13px; opacity: 0.9;'>Demand</div>
+            </div>
+            <div style='text-align: center;'>
+                <div style='font-size: 24px; font-weight: 700;'>12 days</div>
+                <div style='font-size: 13px; opacity: 0.9;'>To Sell</div>
+            </div>
+            <div style='text-align: center;'>
+                <div style='font-size: 24px; font-weight: 700;'>↑ +5%</div>
+                <div style='font-size: 13px; opacity: 0.9;'>Price Trend</div>
+            </div>
+        </div>
+    </div>
+    """
+
+MARKET_STATS_HTML = f"""
+    <div style='display: flex; flex-wrap: wrap; gap: 16px;'>
+        <div style='flex: 1; min-width: 140px; background: linear-gradient(135deg, #4caf50 0%, #45a049 100%); 
+                    padding: 20px; border-radius: 12px; text-align: center; color: white;'>
+            <div style='font-size: 32px; font-weight: 700;'>HIGH</div>
+            <div style='font-size: 14px; margin-top: 8px;'>Demand Level</div>
+        </div>
+        <div style='flex: 1; min-width: 140px; background: linear-gradient(135deg, {ACCENT} 0%, #1873cc 100%); 
+                    padding: 20px; border-radius: 12px; text-align: center; color: white;'>
+            <div style='font-size: 32px; font-weight: 700;'>12</div>
+            <div style='font-size: 14px; margin-top: 8px;'>Days to sell</div>
+        </div>
+        <div style='flex: 1; min-width: 140px; background: linear-gradient(135deg, #ff9800 0%, #f57c00 100%); 
+                    padding: 20px; border-radius: 12px; text-align: center; color: white;'>
+            <div style='font-size: 32px; font-weight: 700;'>87%</div>
+            <div style='font-size: 14px; margin-top: 8px;'>Of asking price</div>
+        </div>
+    </div>
+    """
+
+DEAL_BONUSES_HTML = f"""
+    <div style='display: flex; flex-wrap: wrap; gap: 16px;'>
+        <div style='flex: 1; min-width: 220px; background-color: #e8f5e9; padding: 24px; border-radius: 12px; border-left: 6px solid #4caf50;'>
+            <div style='font-size: 20px; font-weight: 600; color: #2e7d32; margin-bottom: 12px;'>
+                📦 Stock Priority Bonus
+            </div>
+            <div style='font-size: 36px; font-weight: 900; color: #1b5e20; margin-bottom: 8px;'>+£500</div>
+            <div style='font-size: 14px; color: #666;'>We need this model in stock!</div>
+        </div>
+        <div style='flex: 1; min-width: 220px; background-color: #e3f2fd; padding: 24px; border-radius: 12px; border-left: 6px solid {ACCENT};'>
+            <div style='font-size: 20px; font-weight: 600; color: #1565c0; margin-bottom: 12px;'>
+                ⚡ Same-Day Completion
+            </div>
+            <div style='font-size: 36px; font-weight: 900; color: #0d47a1; margin-bottom: 8px;'>+£200</div>
+            <div style='font-size: 14px; color: #666;'>If completed today</div>
+        </div>
+    </div>
+    """
+
+@lru_cache(maxsize=4096)
+def format_gbp(amount):
+    """Format a whole-pound amount as £12,345"""
+    return f"£{amount:,}"
+
+@lru_cache(maxsize=64)
+def status_badges_html(write_off, theft, mileage_anomaly, open_recalls):
+    """Status Flags line for a vehicle's history flags and open recall count"""
+    badges = []
+    if write_off:
+        badges.append('<span class="badge badge-error">Write-off</span>')
+    if theft:
+        badges.append('<span class="badge badge-error">Theft Record</span>')
+    if mileage_anomaly:
+        badges.append('<span class="badge badge-warning">Mileage Anomaly</span>')
+    if open_recalls:
+        badges.append(f'<span class="badge badge-warning">{open_recalls} Open Recall(s)</span>')
+    if not badges:
+        badges.append('<span class="badge badge-success">No Issues Found</span>')
+    return f"<p><strong>Status Flags:</strong> {' '.join(badges)}</p>"
+
+@lru_cache(maxsize=64)
+def price_forecast_html(current_value, start_date):
+    """Six monthly depreciation rows starting from start_date"""
+    forecast_rows = []
+    for i in range(1, 7):
+        month_date = start_date + datetime.timedelta(days=30*i)
+        depreciation = -2.5 * i
+        projected_value = int(current_value * (1 + depreciation / 100))
+        
+        forecast_rows.append(f"""
+        <div style='padding: 8px 0; border-bottom: 1px solid #ddd;'>
+            <div style='display: flex; justify-content: space-between;'>
+                <span>{month_date.strftime("%b %Y")}</span>
+                <span>
+                    <strong>{format_gbp(projected_value)}</strong>
+                    <span style='color: #f44336; font-size: 13px; margin-left: 8px;'>({depreciation:.1f}%)</span>
+                </span>
+            </div>
+        </div>
+        """)
+    return "".join(forecast_rows)
+
+@lru_cache(maxsize=64)
+def valuation_card_html(value, year, make, model):
+    """Headline estimated-value card for the valuation tab"""
+    return f"""
+    <div style='background: var(--brand-gradient); 
+                padding: 28px; border-radius: 12px; text-align: center; color: white; margin-bottom: 24px;'>
+        <div style='font-size: 16px; opacity: 0.9; margin-bottom: 8px;'>Estimated Vehicle Value</div>
+        <div style='font-size: 48px; font-weight: 900; margin: 12px 0;'>{format_gbp(value)}</div>
+        <div style='font-size: 14px; opacity: 0.85;'>
+            {year} {make} {model}
+        </div>
+    </div>
+    """
+
+@lru_cache(maxsize=64)
+def upgrade_options_html(options, trade_in_value):
+    """Upgrade cards for (model, year, price) options against a trade-in value"""
+    option_cards = []
+    for model, model_year, price in options:
+        remaining_amount = price - trade_in_value
+        trade_in_percentage = int((trade_in_value / price) * 100)
+        monthly_payment = int(remaining_amount * 0.023)
+        
+        border_color = "#4caf50" if trade_in_percentage >= 40 else ACCENT if trade_in_percentage >= 25 else "#ff9800"
+        
+        option_cards.append(f"""
+        <div style='background-color: #f8f9fa; padding: 16px 20px; border-radius: 12px; margin: 12px 0; 
+                    border-left: 6px solid {border_color};'>
+            <div style='display: flex; justify-content: space-between; align-items: center;'>
+                <div>
+                    <div style='font-size: 18px; font-weight: 700; color: {PRIMARY};'>
+                        🚘 {model}
+                    </div>
+                    <div style='font-size: 13px; color: #666;'>{model_year} Model • {format_gbp(price)}</div>
+                </div>
+                <div style='text-align: right;'>
+                    <div style='background-color: {border_color}; color: white; padding: 4px 10px; 
+                                border-radius: 16px; font-weight: 700; font-size: 13px;'>
+                        {trade_in_percentage}% Covered
+                    </div>
+                </div>
+            </div>
+        </div>
+        <div style='display: grid; grid-template-columns: repeat(3, 1fr); gap: 16px; margin-bottom: 16px;'>
+            <div style='background-color: white; padding: 12px; border-radius: 8px; text-align: center;'>
+                <div style='font-size: 10px; color: #999; text-transform: uppercase; margin-bottom: 6px;'>
+                    TRADE-IN
+                </div>
+                <div style='font-size: 20px; font-weight: 700; color: #4caf50;'>
+                    {format_gbp(trade_in_value)}
+                </div>
+            </div>
+            <div style='background-color: white; padding: 12px; border-radius: 8px; text-align: center;'>
+                <div style='font-size: 10px; color: #999; text-transform: uppercase; margin-bottom: 6px;'>
+                    YOU PAY
+                </div>
+                <div style='font-size: 20px; font-weight: 700; color: {PRIMARY};'>
+                    {format_gbp(remaining_amount)}
+                </div>
+            </div>
+            <div style='background-color: white; padding: 12px; border-radius: 8px; text-align: center;'>
+                <div style='font-size: 10px; color: #999; text-transform: uppercase; margin-bottom: 6px;'>
+                    MONTHLY
+                </div>
+                <div style='font-size: 20px; font-weight: 700; color: {ACCENT};'>
+                    £{monthly_payment}/mo
+                </div>
+            </div>
+        </div>
+        """)
+    return "".join(option_cards)
+
+@lru_cache(maxsize=64)
+def deal_bonuses_html(total_with_bonuses, validity_hours):
+    """Bonus cards followed by the maximum potential offer, as one block"""
+    return DEAL_BONUSES_HTML + f"""
+    <div style='background-color: #fff3cd; padding: 24px; border-radius: 12px; border-left: 4px solid #ffc107; margin-top: 24px;'>
+        <div style='text-align: center;'>
+            <div style='font-size: 16px; color: #666; margin-bottom: 8px;'><strong>Maximum Potential Offer</strong></div>
+            <div style='font-size: 42px; font-weight: 900; color: {PRIMARY};'>{format_gbp(total_with_bonuses)}</div>
+            <div style='font-size: 14px; color: #666; margin-top: 8px;'><em>Base value + all bonuses • Valid for {validity_hours} hours</em></div>
+        </div>
+    </div>
+    """
+
+@lru_cache(maxsize=64)
+def network_offers_html(offsets, total_value):
+    """Best-offer rows for (location, offset, badge) entries across the network"""
+    offer_rows = []
+    for location, offset, badge in offsets:
+        badge_html = f"<span style='color: #ffa726; margin-left: 8px;'>{badge}</span>" if badge else ""
+        offer_rows.append(f"""
+        <div style='background-color: #f8f9fa; padding: 16px 20px; border-radius: 8px; margin: 12px 0; 
+                    display: flex; justify-content: space-between; align-items: center; border-left: 4px solid {ACCENT};'>
+            <div>
+                <strong style='font-size: 16px;'>{location}</strong>{badge_html}
+            </div>
+            <div style='text-align: right;'>
+                <div style='font-size: 24px; font-weight: 700; color: {PRIMARY};'>{format_gbp(total_value + offset)}</div>
+            </div>
+        </div>
+        """)
+    return "".join(offer_rows)